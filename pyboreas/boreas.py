@@ -1,6 +1,7 @@
-import multiprocessing
 import os
-from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from itertools import chain
 
 from pyboreas.data.sequence import Sequence
 
@@ -11,10 +12,6 @@ class BoreasDataset:
     ):
         self.root = root
         self.split = split
-        self.aeva_frames = []
-        self.camera_frames = []
-        self.lidar_frames = []
-        self.radar_frames = []
         self.sequences = []
         self.seqDict = {}  # seq string to index
         self.map = None  # TODO: Load the HD map data
@@ -29,20 +26,17 @@ class BoreasDataset:
                 ]
             )
 
-        # It takes a few seconds to construct each sequence, so we parallelize this
-        global _load_seq
-
+        # It takes a few seconds to construct each sequence, so we parallelize
+        # this. The work is filesystem I/O, so threads overlap it fine and we
+        # avoid the fork/pickle overhead of a process pool.
         def _load_seq(seqSpec):
             return Sequence(root, seqSpec, labelFolder=self.labelFolder)
 
-        pool = Pool(multiprocessing.cpu_count())
-        self.sequences = list(pool.map(_load_seq, split))
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(split)))) as ex:
+            self.sequences = list(ex.map(_load_seq, split))
         self.sequences.sort(key=lambda x: x.ID)
 
         for seq in self.sequences:
-            self.camera_frames += seq.camera_frames
-            self.lidar_frames += seq.lidar_frames
-            self.radar_frames += seq.radar_frames
             self.seqDict[seq.ID] = len(self.seqDict)
             if verbose:
                 seq.print()
@@ -52,6 +46,24 @@ class BoreasDataset:
             print("total lidar frames: {}".format(len(self.lidar_frames)))
             print("total radar frames: {}".format(len(self.radar_frames)))
 
+    # The flattened cross-sequence frame lists can be large; build them
+    # lazily on first access instead of materializing them in __init__.
+    @cached_property
+    def aeva_frames(self):
+        return list(chain.from_iterable(seq.aeva_frames for seq in self.sequences))
+
+    @cached_property
+    def camera_frames(self):
+        return list(chain.from_iterable(seq.camera_frames for seq in self.sequences))
+
+    @cached_property
+    def lidar_frames(self):
+        return list(chain.from_iterable(seq.lidar_frames for seq in self.sequences))
+
+    @cached_property
+    def radar_frames(self):
+        return list(chain.from_iterable(seq.radar_frames for seq in self.sequences))
+
     def get_seq_from_ID(self, ID):
         return self.sequences[self.seqDict[ID]]
 
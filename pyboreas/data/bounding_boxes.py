@@ -4,12 +4,12 @@ import numpy as np
 
 from pyboreas.data.pointcloud import PointCloud
 from pyboreas.utils.utils import (
+    apply_se3,
     get_inverse_tf,
     get_time_from_filename,
-    get_transform2,
     rotToYawPitchRoll,
     se3ToSE3,
-    yawPitchRollToRot,
+    yaw_batch,
 )
 from pylgmath import so3op
 from pyboreas.vis.vis_utils import draw_boxes
@@ -27,28 +27,29 @@ class BoundingBoxes:
         self.path = path
         with open(path) as f:
             self.timestamp = get_time_from_filename(path)
-            for line in f:
-                parts = line.split()
-                uuid = parts[0]
-                label = parts[1]
-                ext = np.array(
-                    [float(parts[2]), float(parts[3]), float(parts[4])]
-                ).reshape(-3, 1)
-                pos = np.array(
-                    [float(parts[5]), float(parts[6]), float(parts[7])]
-                ).reshape(-3, 1)
-                yaw = float(parts[8])
-                rot = yawPitchRollToRot(yaw, 0, 0)
-                if parts[9] == "None":
-                    numPoints = 0
-                else:
-                    numPoints = int(parts[9])
-                score = -1
-                if len(parts) >= 11:
-                    score = float(parts[10])
-                self.bbs.append(
-                    BoundingBox(pos, ext, rot, label, uuid, numPoints, score)
-                )
+            rows = [line.split() for line in f]
+        # Labels store a pure yaw angle; build every rotation in one
+        # batched cos/sin pass instead of one 3x3 allocation per label.
+        rots = yaw_batch([float(parts[8]) for parts in rows])
+        for parts, rot in zip(rows, rots):
+            uuid = parts[0]
+            label = parts[1]
+            ext = np.array(
+                [float(parts[2]), float(parts[3]), float(parts[4])]
+            ).reshape(-3, 1)
+            pos = np.array(
+                [float(parts[5]), float(parts[6]), float(parts[7])]
+            ).reshape(-3, 1)
+            if parts[9] == "None":
+                numPoints = 0
+            else:
+                numPoints = int(parts[9])
+            score = -1
+            if len(parts) >= 11:
+                score = float(parts[10])
+            self.bbs.append(
+                BoundingBox(pos, ext, rot, label, uuid, numPoints, score)
+            )
 
     def save_to_file(self, path):
         with open(path, "w") as f:
@@ -75,8 +76,22 @@ class BoundingBoxes:
             bb.render_2d(ax, color, **kwargs)
 
     def transform(self, T):
-        for bb in self.bbs:
-            bb.transform(T)
+        # Batch the per-box matmuls into a few large ones instead of
+        # looping bb.transform(T) over each box.
+        assert T.shape[0] == 4 and T.shape[1] == 4
+        if len(self.bbs) == 0:
+            return
+        C = T[:3, :3]
+        pos = np.concatenate([bb.pos for bb in self.bbs], axis=1)  # (3, N)
+        pos = np.matmul(C, pos) + T[:3, 3:]
+        rots = np.stack([bb.rot for bb in self.bbs])  # (N, 3, 3)
+        rots = np.matmul(C, rots)
+        corners = np.concatenate([bb.pc.points for bb in self.bbs])  # (8N, 3)
+        corners = apply_se3(T, corners)
+        for i, bb in enumerate(self.bbs):
+            bb.pos = pos[:, i : i + 1]
+            bb.rot = rots[i]
+            bb.pc.points = corners[8 * i : 8 * (i + 1)]
 
     def remove_motion(self, body_rate, tref):
         for bb in self.bbs:
@@ -205,31 +220,28 @@ class BoundingBox:
         # Construct array to extract points from extent
         # self.corner_map = {'ftr':0, 'ftl':1, 'btl':2, 'btr':3,
         #               'fbr':4, 'fbl':5, 'bbl':6, 'bbr':7}
-        self.dims = [
-            [1, 1, 1],
-            [-1, 1, 1],
-            [-1, -1, 1],
-            [1, -1, 1],
-            [1, 1, -1],
-            [-1, 1, -1],
-            [-1, -1, -1],
-            [1, -1, -1],
-        ]
+        self.dims = np.array(
+            [
+                [1, 1, 1],
+                [-1, 1, 1],
+                [-1, -1, 1],
+                [1, -1, 1],
+                [1, 1, -1],
+                [-1, 1, -1],
+                [-1, -1, -1],
+                [1, -1, -1],
+            ],
+            dtype=np.float64,
+        )
         self._get_box_corners()
 
     def _get_box_corners(self):
-        def _get_point_with_offset(pose, offset):
-            p = np.array([offset[0], offset[1], offset[2], 1]).reshape(-1, 1)
-            return np.matmul(pose, p)[:3, 0]
-        pose = get_transform2(self.rot, self.pos)
-        points = []
-        for i in range(len(self.dims)):
-            points.append(
-                _get_point_with_offset(
-                    pose, self.extent.squeeze() * np.array(self.dims[i]) / 2
-                )
-            )
-        self.pc = PointCloud(np.array(points))
+        # corners = C @ offset + r for all 8 corners at once; by
+        # associativity there is no need to form the 4x4 pose or
+        # homogeneous corner coordinates.
+        offsets = self.dims * self.extent.reshape(1, 3) / 2  # (8, 3)
+        corners = np.matmul(offsets, self.rot.transpose()) + self.pos.reshape(1, 3)
+        self.pc = PointCloud(corners)
 
     def render_2d(self, ax, color="r", **kwargs):
         """Render the bbox into a top-down 2d view
@@ -262,10 +274,12 @@ class BoundingBox:
 
     def transform(self, T):
         assert T.shape[0] == 4 and T.shape[1] == 4
-        pose = get_transform2(self.rot, self.pos)
-        pose = np.matmul(T, pose)
-        self.pos = pose[:3, 3:]
-        self.rot = pose[:3, :3]
+        # The bottom rows of T and the box pose are both [0, 0, 0, 1], so
+        # compose the rotation and translation blocks directly instead of
+        # forming two 4x4s and multiplying them.
+        C = T[:3, :3]
+        self.pos = np.matmul(C, self.pos) + T[:3, 3:]
+        self.rot = np.matmul(C, self.rot)
         self.pc.transform(T)
 
     def remove_motion(self, body_rate, tref):
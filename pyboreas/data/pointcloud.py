@@ -3,7 +3,9 @@ from multiprocessing import Pool
 
 import numpy as np
 
-from pyboreas.utils.utils import is_sorted, se3ToSE3
+from pyboreas.utils.utils import apply_se3, is_sorted, se3ToSE3
+
+_rng = np.random.default_rng()
 
 
 class PointCloud:
@@ -28,8 +30,9 @@ class PointCloud:
             points = self.points
         else:
             points = np.copy(self.points)
-        p = np.hstack((points[:, :3], np.ones((points.shape[0], 1))))
-        points[:, :3] = np.matmul(p, T.transpose())[:, :3]
+        # Rotate-then-translate instead of padding with ones and using the
+        # full 4x4: same result, one less allocation and 25% fewer FLOPs.
+        points[:, :3] = apply_se3(T, points[:, :3])
         return points
 
     def remove_motion(self, body_rate, tref=None, in_place=True, single=False):
@@ -77,9 +80,7 @@ class PointCloud:
                     (points[:, -1] >= tbins[i]) & (points[:, -1] < tbins[i + 1])
                 )
                 p = points[locs]
-                p = np.hstack((p[:, :3], np.ones((p.shape[0], 1))))
-                p = np.matmul(p, T_undistorts[i].transpose())
-                p = np.hstack((p[:, :3], points[locs][:, 3:]))
+                p[:, :3] = apply_se3(T_undistorts[i], p[:, :3])
                 points[locs] = p
         else:
             p = Pool(multiprocessing.cpu_count())
@@ -132,7 +133,6 @@ class PointCloud:
             colors (np.ndarray): (N,) a color value for each pixel location in uv.
             mask (np.ndarray): mask to select only points that project onto image.
         """
-        colors = []
         x = np.hstack((self.points[:, :3], np.ones((self.points.shape[0], 1))))
         x /= x[:, 2:3]
         x[:, 3] = 1
@@ -157,7 +157,11 @@ class PointCloud:
         return x[:, :2], colors, mask
 
     def random_downsample(self, downsample_rate, in_place=True):
-        rand_idx = np.random.choice(
+        # Generator-based choice samples without replacement much faster
+        # than the legacy np.random.choice, which permutes all N indices.
+        # Downsample before transforming a cloud: work done on points
+        # that are then discarded scales with 1 / downsample_rate.
+        rand_idx = _rng.choice(
             self.points.shape[0],
             size=int(self.points.shape[0] * downsample_rate),
             replace=False,
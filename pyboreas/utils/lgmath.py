@@ -208,6 +208,10 @@ def _tran2vec(T_ab):
     aaxis_ba = _rot2vec(T_ab[:3, :3])
     rho_ba = _vec2jacinv(aaxis_ba) @ T_ab[:3, 3:]
 
-    xi_ba = np.concatenate((rho_ba, aaxis_ba))
+    # Pack into a preallocated 6x1 instead of concatenating (one
+    # allocation, no intermediate copies).
+    xi_ba = np.empty((6, 1))
+    xi_ba[:3] = rho_ba
+    xi_ba[3:] = aaxis_ba
 
     return xi_ba
@@ -55,6 +55,31 @@ def load_radar(example_path):
     fft_data = np.squeeze(fft_data)
     return timestamps, azimuths, valid, fft_data, resolution
 
+# The cartesian sampling grid only depends on the output geometry, not on
+# the radar frame, so cache it across calls (keyed by resolution/width).
+_cart_sample_cache = {}
+
+
+def _get_cart_sample_grid(cart_resolution, cart_pixel_width):
+    key = (cart_resolution, cart_pixel_width)
+    cached = _cart_sample_cache.get(key)
+    if cached is None:
+        if (cart_pixel_width % 2) == 0:
+            cart_min_range = (cart_pixel_width / 2 - 0.5) * cart_resolution
+        else:
+            cart_min_range = cart_pixel_width // 2 * cart_resolution
+        coords = np.linspace(
+            -cart_min_range, cart_min_range, cart_pixel_width, dtype=np.float32
+        )
+        Y, X = np.meshgrid(coords, -1 * coords)
+        sample_range = np.sqrt(Y * Y + X * X)
+        sample_angle = np.arctan2(Y, X)
+        sample_angle += (sample_angle < 0).astype(np.float32) * 2.0 * np.pi
+        cached = (sample_range, sample_angle)
+        _cart_sample_cache[key] = cached
+    return cached
+
+
 def radar_polar_to_cartesian(
     azimuths,
     fft_data,
@@ -78,17 +103,9 @@ def radar_polar_to_cartesian(
     Returns:
         np.ndarray: Cartesian radar power readings
     """
-    if (cart_pixel_width % 2) == 0:
-        cart_min_range = (cart_pixel_width / 2 - 0.5) * cart_resolution
-    else:
-        cart_min_range = cart_pixel_width // 2 * cart_resolution
-    coords = np.linspace(
-        -cart_min_range, cart_min_range, cart_pixel_width, dtype=np.float32
+    sample_range, sample_angle = _get_cart_sample_grid(
+        cart_resolution, cart_pixel_width
     )
-    Y, X = np.meshgrid(coords, -1 * coords)
-    sample_range = np.sqrt(Y * Y + X * X)
-    sample_angle = np.arctan2(Y, X)
-    sample_angle += (sample_angle < 0).astype(np.float32) * 2.0 * np.pi
 
     # Interpolate Radar Data Coordinates
     azimuth_step = (azimuths[-1] - azimuths[0]) / (azimuths.shape[0] - 1)
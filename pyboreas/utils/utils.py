@@ -4,7 +4,7 @@ from pathlib import Path
 
 import numpy as np
 
-from pyboreas.utils.lgmath import _tran2vec, _vec2tran, carrot
+from pyboreas.utils.lgmath import _tran2vec, _vec2tran
 
 
 def load_lidar(path, dim=6):
@@ -38,6 +38,26 @@ def yaw(y):
     )
 
 
+def yaw_batch(y):
+    """Batched version of yaw: builds (N, 3, 3) rotation matrices for N angles
+        with one cos/sin pass and a single allocation instead of N small ones.
+    Args:
+        y (np.ndarray): (N,) yaw angles
+    Returns:
+        np.ndarray: (N, 3, 3) rotation matrices
+    """
+    y = np.asarray(y, dtype=np.float64)
+    c = np.cos(y)
+    s = np.sin(y)
+    C = np.zeros((len(y), 3, 3), dtype=np.float64)
+    C[:, 0, 0] = c
+    C[:, 0, 1] = s
+    C[:, 1, 0] = -s
+    C[:, 1, 1] = c
+    C[:, 2, 2] = 1
+    return C
+
+
 def yawPitchRollToRot(y, p, r):
     return roll(r) @ pitch(p) @ yaw(y)
 
@@ -90,6 +110,45 @@ def get_transform(gt):
     return T
 
 
+def get_transform_batch(gts):
+    """Retrieves 4x4 homogeneous transforms for N parsed lines of a ground truth pose csv at once
+        Batch analogue of get_transform: one vectorized trig pass and two batched
+        matmuls instead of re-entering Python for every frame.
+    Args:
+        gts (np.ndarray): (N, >=10) array, each row a parsed line from the csv
+    Returns:
+        np.ndarray: (N, 4, 4) transformation matrices (poses of sensor)
+    """
+    gts = np.asarray(gts, dtype=np.float64)
+    N = gts.shape[0]
+    cr, sr = np.cos(gts[:, 7]), np.sin(gts[:, 7])
+    cp, sp = np.cos(gts[:, 8]), np.sin(gts[:, 8])
+    cy, sy = np.cos(gts[:, 9]), np.sin(gts[:, 9])
+    R = np.zeros((N, 3, 3), dtype=np.float64)
+    R[:, 0, 0] = 1
+    R[:, 1, 1] = cr
+    R[:, 1, 2] = sr
+    R[:, 2, 1] = -sr
+    R[:, 2, 2] = cr
+    P = np.zeros((N, 3, 3), dtype=np.float64)
+    P[:, 0, 0] = cp
+    P[:, 0, 2] = -sp
+    P[:, 1, 1] = 1
+    P[:, 2, 0] = sp
+    P[:, 2, 2] = cp
+    Y = np.zeros((N, 3, 3), dtype=np.float64)
+    Y[:, 0, 0] = cy
+    Y[:, 0, 1] = sy
+    Y[:, 1, 0] = -sy
+    Y[:, 1, 1] = cy
+    Y[:, 2, 2] = 1
+    T = np.zeros((N, 4, 4), dtype=np.float64)
+    T[:, :3, :3] = np.matmul(R, np.matmul(P, Y))
+    T[:, :3, 3] = gts[:, 1:4]
+    T[:, 3, 3] = 1
+    return T
+
+
 def get_transform2(R, t):
     """Returns a 4x4 homogeneous 3D transform
     Args:
@@ -129,17 +188,30 @@ def quaternionToRot(qin):
     Returns:
         C (np.ndarray) (3,3) rotation matrix
     """
-    q = qin.copy().reshape(4, 1)
-    if np.matmul(q.transpose(), q) < 1e-14:
+    q = np.ravel(qin)
+    x, y, z, w = q[0], q[1], q[2], q[3]
+    if x * x + y * y + z * z + w * w < 1e-14:
         return np.identity(3)
-    xi = q[:3].reshape(3, 1)
-    eta = q[3, 0]
-    C = (
-        (eta**2 - np.matmul(xi.transpose(), xi)) * np.identity(3)
-        + 2 * np.matmul(xi, xi.transpose())
-        - 2 * eta * carrot(xi)
+    # Expand (eta^2 - xi^T xi) I + 2 xi xi^T - 2 eta carrot(xi) entry-wise:
+    # the 18-multiply assembly avoids the identity/outer-product/carrot
+    # temporaries and their matmuls.
+    xx = x * x
+    yy = y * y
+    zz = z * z
+    ww = w * w
+    xy = x * y
+    xz = x * z
+    yz = y * z
+    wx = w * x
+    wy = w * y
+    wz = w * z
+    return np.array(
+        [
+            [ww + xx - yy - zz, 2 * (xy + wz), 2 * (xz - wy)],
+            [2 * (xy - wz), ww - xx + yy - zz, 2 * (yz + wx)],
+            [2 * (xz + wy), 2 * (yz - wx), ww - xx - yy + zz],
+        ]
     )
-    return C
 
 
 def rotToQuaternion(C):
@@ -166,6 +238,21 @@ def rotToQuaternion(C):
     return q
 
 
+def apply_se3(T, X, out=None):
+    """Applies a rigid transform to an (N, 3) array of points: x_out = C @ x + r
+        Avoids forming homogeneous coordinates and multiplying by the full 4x4.
+    Args:
+        T (np.ndarray): 4x4 transformation matrix T = [C, r; 0 0 0 1]
+        X (np.ndarray): (N, 3) array of points
+        out (np.ndarray): optional (N, 3) output buffer, must not overlap with X
+    Returns:
+        np.ndarray: (N, 3) transformed points
+    """
+    out = np.matmul(X, T[:3, :3].transpose(), out=out)
+    out += T[:3, 3]
+    return out
+
+
 def get_inverse_tf(T):
     """Returns the inverse of a given 4x4 homogeneous transform.
     Args:
@@ -268,12 +355,10 @@ def translation_error(T, dim=3):
 
 
 def wrapto2pi(phi):
-    """Ensures that the output angle phi is within the interval [0, 2*pi)"""
-    if phi < 0:
-        return phi + 2 * np.pi * np.ceil(phi / (-2 * np.pi))
-    elif phi >= 2 * np.pi:
-        return (phi / (2 * np.pi) % 1) * 2 * np.pi
-    return phi
+    """Ensures that the output angle phi is within the interval [0, 2*pi)
+    Accepts a scalar or an np.ndarray, so arrays of angles wrap in one pass.
+    """
+    return np.mod(phi, 2 * np.pi)
 
 
 def get_time_from_filename(file):
@@ -1,5 +1,3 @@
-import io
-
 import cv2
 import matplotlib.pyplot as plt
 import numpy as np
@@ -7,11 +5,14 @@ import PIL
 
 
 def convert_plt_to_img(dpi=128):
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", pad_inches=0)
-    plt.close()
-    buf.seek(0)
-    return PIL.Image.open(buf)
+    # Grab the rendered canvas directly rather than round-tripping
+    # through a PNG encode/decode and savefig's tight-bbox layout pass.
+    fig = plt.gcf()
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    img = PIL.Image.fromarray(np.asarray(fig.canvas.buffer_rgba()))
+    plt.close(fig)
+    return img
 
 
 def vis_camera(cam, figsize=(24.48, 20.48), dpi=100, show=True, save=None):
@@ -38,6 +39,7 @@ def vis_lidar(
     elev_delta=-5,
     show=True,
     save=None,
+    backend="mpl",
 ):
     p = lid.points
     if color == "x":
@@ -66,27 +68,32 @@ def vis_lidar(
     if vmin is None or vmax is None:
         vmin = np.min(c)
         vmax = np.max(c)
+    if backend == "open3d":
+        # GPU-rasterized viewer; much faster than matplotlib's 3D axes
+        # for full-size lidar scans.
+        return _vis_lidar_open3d(p, c, cmap, vmin, vmax, colorvec=colorvec)
     fig = plt.figure(figsize=figsize)
     ax = fig.add_subplot(projection="3d")
     ax.azim += azim_delta
     ax.elev += elev_delta
-    xs = p[:, 0]
-    ys = p[:, 1]
-    zs = p[:, 2]
-    ax.set_box_aspect((np.ptp(xs), np.ptp(ys), np.ptp(zs)))
+    # Slice the coordinates into one contiguous (N, 3) block up front so
+    # the per-axis views handed to scatter copy from cache-friendly
+    # memory (and can be passed to a GL vertex buffer without conversion).
+    xyz = np.ascontiguousarray(p[:, :3])
+    xs = xyz[:, 0]
+    ys = xyz[:, 1]
+    zs = xyz[:, 2]
+    # One min/max sweep over all three coords instead of three np.ptp calls
+    mins = xyz.min(axis=0)
+    maxs = xyz.max(axis=0)
+    ax.set_box_aspect(tuple(maxs - mins))
     ax.set_axis_off()
     if colorvec is None:
-        ax.scatter(
-            xs=xs,
-            ys=ys,
-            zs=zs,
-            s=0.1,
-            c=c,
-            cmap=cmap,
-            vmin=vmin,
-            vmax=vmax,
-            depthshade=False,
-        )
+        # Evaluate the colormap once up front and pass RGBA directly:
+        # with a scalar c + cmap, matplotlib re-maps colors on every
+        # redraw (zoom/rotate), not just the first draw.
+        rgba = plt.get_cmap(cmap)(np.clip((c - vmin) / (vmax - vmin + 1e-12), 0, 1))
+        ax.scatter(xs=xs, ys=ys, zs=zs, s=0.1, c=rgba, depthshade=False)
     else:
         ax.scatter(xs=xs, ys=ys, zs=zs, s=0.1, c=c, depthshade=False)
     if show:
@@ -96,6 +103,32 @@ def vis_lidar(
     return ax
 
 
+def _vis_lidar_open3d(p, c, cmap, vmin, vmax, colorvec=None):
+    try:
+        import open3d as o3d
+    except ImportError:
+        raise ImportError(
+            "open3d is required for backend='open3d': pip install open3d"
+        )
+    pcd = o3d.geometry.PointCloud()
+    pcd.points = o3d.utility.Vector3dVector(np.ascontiguousarray(p[:, :3]))
+    if colorvec is not None:
+        # Mirror the mpl path: a colorvec bypasses the colormap and is
+        # used as direct per-point colors, which open3d only supports as
+        # an (N, 3) RGB array.
+        colorvec = np.asarray(colorvec, dtype=np.float64)
+        if colorvec.ndim != 2 or colorvec.shape[1] != 3:
+            raise ValueError(
+                "backend='open3d' requires colorvec to be an (N, 3) RGB array"
+            )
+        colors = np.ascontiguousarray(colorvec)
+    else:
+        colors = plt.get_cmap(cmap)((c - vmin) / (vmax - vmin + 1e-12))[:, :3]
+    pcd.colors = o3d.utility.Vector3dVector(colors)
+    o3d.visualization.draw_geometries([pcd])
+    return pcd
+
+
 def vis_radar(
     rad,
     figsize=(10, 10),
@@ -123,41 +156,52 @@ def vis_radar(
 
 
 def bilinear_interp(img, X, Y):
-    x = np.array(X).squeeze()
-    y = np.array(Y).squeeze()
+    x = np.ravel(X).astype(np.float64)
+    y = np.ravel(Y).astype(np.float64)
+
+    # cv2.remap does the same gather-and-blend in one SIMD pass with no
+    # temporaries; use it for the image dtypes it supports natively (the
+    # output dtype then matches the image dtype). remap asserts
+    # dst.cols < SHRT_MAX, so the coordinates are tiled into a map no
+    # wider than that limit (padding the tail with the first sample).
+    if (img.dtype == np.uint8 or img.dtype == np.float32) and x.size > 0:
+        n = x.size
+        width = min(n, 32766)
+        rows = (n + width - 1) // width
+        xmap = np.full(rows * width, x[0], dtype=np.float32)
+        ymap = np.full(rows * width, y[0], dtype=np.float32)
+        xmap[:n] = x
+        ymap[:n] = y
+        f = cv2.remap(
+            img,
+            xmap.reshape(rows, width),
+            ymap.reshape(rows, width),
+            cv2.INTER_LINEAR,
+        )
+        return f.reshape(rows * width, -1)[:n].squeeze()
 
+    H, W = img.shape[:2]
     x1 = np.floor(x).astype(np.int32)
-    x2 = np.ceil(x).astype(np.int32)
     y1 = np.floor(y).astype(np.int32)
-    y2 = np.ceil(y).astype(np.int32)
-
-    mask = np.where(x1 == x2)
-
-    q11 = img[y1, x1]  # N x 3
-    q12 = img[y2, x1]
-    q21 = img[y1, x2]
-    q22 = img[y2, x2]
-
-    EPS = 1e-14
-    x_21 = x2 - x1 + EPS
-    x_2 = ((x2 - x) / x_21).reshape(-1, 1)
-    x_1 = ((x - x1) / x_21).reshape(-1, 1)
-
-    f_y1 = q11 * x_2 + q21 * x_1
-    f_y2 = q12 * x_2 + q22 * x_1
-
-    f_y1[mask] = q11[mask]
-    f_y2[mask] = q22[mask]
-
-    mask = np.where(y1 == y2)
-
-    y_21 = y2 - y1 + EPS
-    y_2 = ((y2 - y) / y_21).reshape(-1, 1)
-    y_1 = ((y - y1) / y_21).reshape(-1, 1)
-
-    f = y_2 * f_y1 + y_1 * f_y2
-    f[mask] = f_y1[mask]
-
+    # Neighbors are always one pixel apart, so the weights are exact and
+    # no degenerate-cell (x1 == x2) masking is needed. Weights come from
+    # the unclipped grid: at the image border the clipped duplicate
+    # neighbor receives weight 0.
+    x2 = np.minimum(x1 + 1, W - 1)
+    y2 = np.minimum(y1 + 1, H - 1)
+
+    w_x1 = (x - x1).reshape(-1, 1)
+    w_x2 = 1.0 - w_x1
+    w_y1 = (y - y1).reshape(-1, 1)
+    w_y2 = 1.0 - w_y1
+
+    flat = img.reshape(H * W, -1)
+    q11 = flat.take(y1 * W + x1, axis=0)
+    q12 = flat.take(y2 * W + x1, axis=0)
+    q21 = flat.take(y1 * W + x2, axis=0)
+    q22 = flat.take(y2 * W + x2, axis=0)
+
+    f = w_y2 * (q11 * w_x2 + q21 * w_x1) + w_y1 * (q12 * w_x2 + q22 * w_x1)
     return f.squeeze()
 
 